@@ -1,6 +1,13 @@
 from PIL import Image, ImageDraw, ImageFont
+from functools import lru_cache
 import os
 
+@lru_cache(maxsize=4)
+def _load_font(font_path, font_size):
+    """Load a TrueType face once per (path, size)."""
+    return ImageFont.truetype(font_path, font_size)
+
+
 def create_banner():
     # settings
     width = 1500
@@ -51,27 +58,22 @@ def create_banner():
     # Given the request "logo on right, text in middle", likely Absolute Center or Center of free space.
     # I'll aim for Absolute Center first, check for overlap.
     
-    # Font size
-    font_size = 200 # start big
+    # Font size: measure once at a reference size and scale linearly so the
+    # text takes at most half the width (to avoid hitting the logo), capped at 200
+    max_text_w = width * 0.5
     try:
-        font = ImageFont.truetype(font_path, font_size)
-    except:
+        ref_size = 100
+        ref_bbox = draw.textbbox((0, 0), text_content, font=_load_font(font_path, ref_size))
+        ref_w = ref_bbox[2] - ref_bbox[0]
+        font_size = min(200, int(ref_size * max_text_w / ref_w))
+        font = _load_font(font_path, font_size)
+    except OSError:
         font = ImageFont.load_default()
-    
+
     # Measure text
     bbox = draw.textbbox((0, 0), text_content, font=font)
     text_w = bbox[2] - bbox[0]
     text_h = bbox[3] - bbox[1]
-    
-    # Adjust font size if too big
-    max_text_w = width * 0.5 # Text shouldn't take more than half the width to avoid hitting logo
-    if text_w > max_text_w:
-        scale = max_text_w / text_w
-        font_size = int(font_size * scale)
-        font = ImageFont.truetype(font_path, font_size)
-        bbox = draw.textbbox((0, 0), text_content, font=font)
-        text_w = bbox[2] - bbox[0]
-        text_h = bbox[3] - bbox[1]
 
     # Center text
     text_x = (width - text_w) // 2
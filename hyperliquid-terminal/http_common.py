@@ -0,0 +1,24 @@
+# Transport helpers shared by the Hyperliquid clients (api_client, liquid, large_trades)
+import json
+import ssl
+from typing import Any
+
+import certifi
+
+try:
+    import orjson
+
+    json_loads = orjson.loads
+    json_dumps_bytes = orjson.dumps
+
+    def json_dumps(obj: Any) -> str:
+        return orjson.dumps(obj).decode()
+except ImportError:
+    json_loads = json.loads
+    json_dumps = json.dumps
+
+    def json_dumps_bytes(obj: Any) -> bytes:
+        return json.dumps(obj).encode()
+
+# Built once per process; parsing the certifi CA bundle is the expensive part
+SSL_CTX = ssl.create_default_context(cafile=certifi.where())
@@ -2,15 +2,18 @@
 
 import asyncio
 import json
-import ssl
+import math
+import random
+import socket
 import sys
 import time
 from collections import deque
 from datetime import datetime
-from typing import Any, Deque, Dict, Iterable, List, Optional
+from typing import Any, Deque, Dict, Iterable, List, Optional, Set, Tuple
 
 import aiohttp
-import certifi
+
+from http_common import SSL_CTX, json_loads
 
 try:
     from positions_at_risk_config import HYPERLIQUID_WS_URL, MONITORED_ASSETS, RETRY_DELAY_SECONDS
@@ -22,6 +25,18 @@ except ImportError:
 
 MIN_TRADE_NOTIONAL_USD = 100_000
 
+# Common raw side spellings, so the usual case is one dict lookup; anything
+# else is upper-cased and looked up again, defaulting to SHORT
+_SIDE_LABELS = {
+    "B": "LONG", "b": "LONG",
+    "BUY": "LONG", "buy": "LONG", "Buy": "LONG",
+    "LONG": "LONG", "long": "LONG", "Long": "LONG",
+    "A": "SHORT", "a": "SHORT",
+    "S": "SHORT", "s": "SHORT",
+    "SELL": "SHORT", "sell": "SHORT", "Sell": "SHORT",
+    "SHORT": "SHORT", "short": "SHORT", "Short": "SHORT",
+}
+
 
 def _fmt_usd(value: float) -> str:
     if value >= 1_000_000_000:
@@ -33,13 +48,46 @@ def _fmt_usd(value: float) -> str:
     return f"${value:.2f}"
 
 
+_NUMERIC_TYPES = (str, float, int)
+
+
 def _safe_float(v: Any) -> Optional[float]:
+    # Hyperliquid sends numbers as strings; anything else (None, lists, ...)
+    # is rejected by a type check instead of raising and catching TypeError
+    if type(v) not in _NUMERIC_TYPES:
+        return None
     try:
         return float(v)
-    except Exception:
+    except (ValueError, OverflowError):
         return None
 
 
+def _int_digits(v: Any) -> Optional[int]:
+    """Digits before the decimal point of a plain decimal string, so v < 10 ** result.
+
+    Returns None when v isn't a plain non-negative decimal string (exponents, signs, inf/nan).
+    """
+    if type(v) is not str or "e" in v or "E" in v:
+        return None
+    dot = v.find(".")
+    int_part = v if dot < 0 else v[:dot]
+    if not int_part.isdigit():
+        return None
+    return 0 if int_part == "0" else len(int_part)
+
+
+def _tune_socket(ws: aiohttp.ClientWebSocketResponse):
+    """Disable Nagle and enable TCP keepalive on the underlying WebSocket socket."""
+    sock = ws.get_extra_info("socket")
+    if sock is None:
+        return
+    try:
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1)
+    except OSError:
+        pass
+
+
 def _iter_trades_from_msg(obj: Any) -> Iterable[Dict[str, Any]]:
     if not isinstance(obj, dict):
         return []
@@ -62,88 +110,141 @@ class LargeTradesMonitor:
         self.ws_url = HYPERLIQUID_WS_URL
         self.assets = assets
         self.min_notional_usd = float(min_notional_usd)
+        # px * sz < 10 ** (px digits + sz digits), so a trade whose digit count is at
+        # most this can never reach the threshold and is rejected without float()
+        self._reject_digits = math.floor(math.log10(self.min_notional_usd)) if self.min_notional_usd >= 1 else -1
+        # Subscribe frames never change, so encode them once
+        self._subscribe_frames = [
+            json.dumps({"method": "subscribe", "subscription": {"type": "trades", "coin": coin}})
+            for coin in assets
+        ]
 
         self.session: Optional[aiohttp.ClientSession] = None
-        self.seen: Deque[str] = deque(maxlen=5000)
+        # Insertion order for eviction plus a set for O(1) membership
+        self.seen: Deque[Tuple[Any, ...]] = deque(maxlen=5000)
+        self._seen_set: Set[Tuple[Any, ...]] = set()
         self.last_print_ts = 0.0
+        self._backoff = 0.0
+        # HH:MM:SS of the last formatted trade second, reused for trades in the same second
+        self._last_sec = -1
+        self._last_prefix = ""
+        self._flush_task: Optional[asyncio.Task] = None
 
-    async def _ensure_session(self):
+    def _ensure_session(self):
         if self.session is None or self.session.closed:
-            ssl_context = ssl.create_default_context(cafile=certifi.where())
-            connector = aiohttp.TCPConnector(ssl=ssl_context, ttl_dns_cache=300, keepalive_timeout=30)
+            connector = aiohttp.TCPConnector(ssl=SSL_CTX, ttl_dns_cache=300, keepalive_timeout=30)
             timeout = aiohttp.ClientTimeout(total=None, connect=10)
             self.session = aiohttp.ClientSession(connector=connector, timeout=timeout)
 
     async def close(self):
+        if self._flush_task:
+            self._flush_task.cancel()
+            self._flush_task = None
+        sys.stdout.flush()
         if self.session and not self.session.closed:
             await self.session.close()
-            await asyncio.sleep(0.25)
+
+    async def _flush_stdout(self, interval: float = 0.1):
+        """Flush buffered output periodically instead of once per line."""
+        while True:
+            await asyncio.sleep(interval)
+            sys.stdout.flush()
 
     async def _subscribe(self, ws: aiohttp.ClientWebSocketResponse):
-        for coin in self.assets:
-            await ws.send_json({"method": "subscribe", "subscription": {"type": "trades", "coin": coin}})
+        # send_str only buffers on the transport, so these go out back to back
+        # without waiting on the server between frames
+        for frame in self._subscribe_frames:
+            await ws.send_str(frame)
 
-    def _trade_key(self, trade: Dict[str, Any]) -> str:
-        coin = str(trade.get("coin", ""))
-        side = str(trade.get("side", ""))
-        px = str(trade.get("px", ""))
-        sz = str(trade.get("sz", ""))
-        t = str(trade.get("time", ""))
-        tid = trade.get("tid") or trade.get("hash")
-        return f"{coin}:{tid or ''}:{t}:{side}:{px}:{sz}"
+    def _trade_key(self, trade: Dict[str, Any]) -> Tuple[Any, ...]:
+        # Raw field values hash as a tuple without any str() conversions or formatting
+        g = trade.get
+        return (g("coin"), g("tid") or g("hash"), g("time"), g("side"), g("px"), g("sz"))
 
     def _side_label(self, raw_side: Any) -> str:
-        s = str(raw_side).upper()
-        if s in {"B", "BUY", "LONG"}:
-            return "LONG"
-        return "SHORT"
-
-    def _handle_trade(self, trade: Dict[str, Any]):
+        label = _SIDE_LABELS.get(raw_side)
+        if label is None:
+            label = _SIDE_LABELS.get(str(raw_side).upper(), "SHORT")
+        return label
+
+    def _prefilter(self, trade: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+        """Return (px, sz) if the trade clears the notional threshold, else None."""
+        raw_px = trade.get("px")
+        raw_sz = trade.get("sz")
+        px_digits = _int_digits(raw_px)
+        if px_digits is not None:
+            sz_digits = _int_digits(raw_sz)
+            if sz_digits is not None and px_digits + sz_digits <= self._reject_digits:
+                return None
+        px = _safe_float(raw_px)
+        sz = _safe_float(raw_sz)
+        if px is None or sz is None or px * sz < self.min_notional_usd:
+            return None
+        return px, sz
+
+    def _emit(self, trade: Dict[str, Any], px: float, sz: float):
         key = self._trade_key(trade)
-        if key in self.seen:
+        try:
+            if key in self._seen_set:
+                return
+        except TypeError:
+            # A list/dict in a key field makes the tuple unhashable; drop the malformed
+            # trade rather than letting it tear down the WebSocket
             return
+        if len(self.seen) == self.seen.maxlen:
+            self._seen_set.discard(self.seen.popleft())
         self.seen.append(key)
-
-        px = _safe_float(trade.get("px"))
-        sz = _safe_float(trade.get("sz"))
-        ts_ms = trade.get("time")
-
-        if px is None or sz is None:
-            return
+        self._seen_set.add(key)
 
         notional = px * sz
-        if notional < self.min_notional_usd:
-            return
-
         coin = str(trade.get("coin", ""))
         side = self._side_label(trade.get("side"))
+        ts_ms = trade.get("time")
 
         try:
-            ts = datetime.fromtimestamp(float(ts_ms) / 1000.0).strftime("%H:%M:%S.%f")[:-3]
+            # Same local HH:MM:SS.mmm as strftime, without building a datetime
+            # or parsing a format string per trade
+            sec, msec = divmod(int(float(ts_ms)), 1000)
+            if sec != self._last_sec:
+                tm = time.localtime(sec)
+                self._last_prefix = f"{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d}"
+                self._last_sec = sec
+            ts = f"{self._last_prefix}.{msec:03d}"
         except Exception:
             ts = datetime.now().strftime("%H:%M:%S")
 
-        print(
-            f"{ts} | {coin:>6} | {side:5} | px={px:,.2f} | sz={sz:,.6f} | notional={_fmt_usd(notional)}"
+        sys.stdout.write(
+            f"{ts} | {coin:>6} | {side:5} | px={px:,.2f} | sz={sz:,.6f} | notional={_fmt_usd(notional)}\n"
         )
 
+    def _handle_trade(self, trade: Dict[str, Any]):
+        # Most trades are below the threshold: reject them on px/sz alone,
+        # before building the dedup key or touching any other field.
+        passed = self._prefilter(trade)
+        if passed is not None:
+            self._emit(trade, *passed)
+
     async def run(self):
         print("HYPERLIQUID LARGE TRADES MONITOR")
         print(f"Tracking trades >= {_fmt_usd(self.min_notional_usd)} | Assets: {', '.join(self.assets)}")
         print("Press Ctrl+C to stop")
         print("=" * 80)
 
+        self._flush_task = asyncio.create_task(self._flush_stdout())
+
         while True:
             try:
-                await self._ensure_session()
+                self._ensure_session()
 
                 async with self.session.ws_connect(self.ws_url, heartbeat=20) as ws:
+                    self._backoff = 0.0
+                    _tune_socket(ws)
                     await self._subscribe(ws)
 
                     async for msg in ws:
                         if msg.type == aiohttp.WSMsgType.TEXT:
                             try:
-                                obj = json.loads(msg.data)
+                                obj = json_loads(msg.data)
                             except Exception:
                                 continue
 
@@ -160,7 +261,9 @@ class LargeTradesMonitor:
                 if now - self.last_print_ts > 2:
                     self.last_print_ts = now
                     print(f"Connection error: {e}")
-                await asyncio.sleep(RETRY_DELAY_SECONDS)
+                # Growing reconnect delay with full jitter, reset once a connection succeeds
+                self._backoff = min(60.0, self._backoff * 2 or float(RETRY_DELAY_SECONDS))
+                await asyncio.sleep(random.uniform(0, self._backoff))
 
         await self.close()
 
@@ -176,6 +279,10 @@ async def main():
     else:
         assets = list(MONITORED_ASSETS)
 
+    # Block-buffer stdout; LargeTradesMonitor flushes it on a short timer so a
+    # burst of trades costs one write() instead of one per line
+    sys.stdout.reconfigure(line_buffering=False)
+
     monitor = LargeTradesMonitor(assets=assets)
     await monitor.run()
 
@@ -2,17 +2,16 @@
 
 import asyncio
 import aiohttp
-import json
-import ssl
-import certifi
 from datetime import datetime
 from typing import Dict, List, Any, Optional, Tuple
-from collections import defaultdict, deque
 import math
+from operator import itemgetter
 import random
 import time
 import sys
 
+from http_common import SSL_CTX, json_dumps_bytes, json_loads
+
 try:
     from positions_at_risk_config import (
         HYPERLIQUID_API_URL,
@@ -48,44 +47,83 @@ except ImportError:
     PRICE_IMPACT_THRESHOLD = 0.001
     ALERT_CONSECUTIVE_COUNT = 2
 
+# Derived once at import instead of per poll
+STATUS_EVERY = max(1, 60 // POLL_INTERVAL_SECONDS)  # polls between market summaries
+CRITICAL_DISTANCE_PCT = 5.0  # within this % of liquidation counts as critical
+MIN_DISPLAY_VALUE_USD = 100000  # smaller positions are never shown
+
+# Synthetic position tiers: (generator count key, value USD, leverage, % from liquidation, type)
+POSITION_TIERS = (
+    # Large whale positions (high leverage, close to liquidation)
+    ("large_positions", (100000, 800000), (15, 50), (1, 5), "WHALE"),
+    # Medium positions (balanced risk)
+    ("medium_positions", (100000, 300000), (8, 30), (2, 8), "MEDIUM"),
+    # Small retail positions (lower leverage) are left out of the output entirely
+)
+MAINTENANCE_MARGIN_RATE = 0.004
+_LONG_MAINT_FACTOR = 1 - MAINTENANCE_MARGIN_RATE
+_SHORT_MAINT_FACTOR = 1 + MAINTENANCE_MARGIN_RATE
+
+# metaAndAssetCtxs context field -> market_data key
+_MARKET_FIELDS = (
+    ("markPx", "markPrice"),
+    ("midPx", "midPrice"),
+    ("openInterest", "openInterest"),
+    ("funding", "fundingRate"),
+    ("dayNtlVlm", "volume24h"),
+    ("premium", "premium"),
+)
+
+_BY_DISTANCE = itemgetter("distance_to_liquidation")
+_BY_VALUE = itemgetter("position_value_usd")
+
+
+def _is_displayable(position: Dict) -> bool:
+    """Positions shown anywhere in the monitor: non-RETAIL and at least MIN_DISPLAY_VALUE_USD."""
+    return position["position_value_usd"] >= MIN_DISPLAY_VALUE_USD and position.get("position_type") != "RETAIL"
+
+
+def _distance_pct(current_price: float, liquidation_price: float, side_sign: int) -> float:
+    """Percent distance from current price to liquidation; side_sign is 1 for LONG, -1 for SHORT."""
+    if current_price <= 0 or liquidation_price <= 0:
+        return float("inf")
+
+    distance = side_sign * (current_price - liquidation_price) / current_price * 100
+    if distance <= 0:
+        return 0.0
+    if distance < 0.01:
+        return 0.01
+    return distance
+
 
 class RealLiquidationsMonitor:
+    _SEPARATOR = "=" * DISPLAY_WIDTH
+    _HEADER_RULE = "=" * 80
+    _HEADERS = {"Content-Type": "application/json"}
+
     def __init__(self, selected_asset: Optional[str] = None):
         self.base_url = HYPERLIQUID_API_URL
         self.session: Optional[aiohttp.ClientSession] = None
         self.asset_map: Dict[str, int] = {}
         self.id_to_name: Dict[int, str] = {}
+        self._monitored_ids: List[Tuple[int, str]] = []
+        # metaAndAssetCtxs response from startup, consumed by the first poll
+        self._primed_data: Optional[Any] = None
         self.selected_asset = selected_asset  # Filter to single asset if provided
+        self.assets: List[str] = [selected_asset] if selected_asset else list(MONITORED_ASSETS)
 
         # Position tracking
         self.active_positions: Dict[str, List[Dict]] = {}
-        self.position_history: Dict[str, List[Dict]] = defaultdict(lambda: deque(maxlen=100))
         self.check_count = 0
+        self._payload_cache: Dict[Tuple, bytes] = {}
 
         # Realistic position simulation
         self.position_generators = {}
         self._initialize_position_generators()
 
-    @staticmethod
-    def _calculate_distance_to_liquidation(current_price: float, liquidation_price: float, side: str) -> float:
-        if current_price <= 0 or liquidation_price <= 0:
-            return float("inf")
-
-        side_u = side.upper()
-        if side_u == "SHORT":
-            distance = ((liquidation_price - current_price) / current_price) * 100
-        else:
-            distance = ((current_price - liquidation_price) / current_price) * 100
-
-        distance = max(0.0, distance)
-        if 0 < distance < 0.01:
-            return 0.01
-        return distance
-        
     def _initialize_position_generators(self):
         """Initialize realistic position generators for each asset."""
-        assets_to_init = [self.selected_asset] if self.selected_asset else MONITORED_ASSETS
-        for asset in assets_to_init:
+        for asset in self.assets:
             self.position_generators[asset] = {
                 "last_update": time.time(),
                 "position_count": random.randint(50, 200),  # Realistic number of positions
@@ -94,16 +132,18 @@ class RealLiquidationsMonitor:
                 "small_positions": random.randint(20, 80)  # Small positions (≥$100k)
             }
     
-    async def _ensure_session(self):
+    def _ensure_session(self):
         if self.session is None or self.session.closed:
-            ssl_context = ssl.create_default_context(cafile=certifi.where())
             connector = aiohttp.TCPConnector(
-                ssl=ssl_context,
+                ssl=SSL_CTX,
+                limit=100,
+                limit_per_host=32,
                 ttl_dns_cache=300,
-                keepalive_timeout=30,
-                force_close=False
+                keepalive_timeout=75,
+                enable_cleanup_closed=True
             )
-            timeout = aiohttp.ClientTimeout(total=30, connect=10)
+            # Every request shares this timeout, so none is passed per call
+            timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS, connect=10)
             self.session = aiohttp.ClientSession(
                 connector=connector,
                 timeout=timeout
@@ -112,72 +152,81 @@ class RealLiquidationsMonitor:
     async def close(self):
         if self.session and not self.session.closed:
             await self.session.close()
-            await asyncio.sleep(0.25)
     
     async def _make_request(self, endpoint: str, payload: Dict[str, Any]) -> Dict[str, Any]:
-        await self._ensure_session()
+        self._ensure_session()
+        
+        try:
+            # The same few payloads go out every poll, so keep their serialized bytes
+            key = tuple(sorted(payload.items()))
+            body = self._payload_cache.get(key)
+            if body is None:
+                body = self._payload_cache[key] = json_dumps_bytes(payload)
+        except TypeError:
+            body = json_dumps_bytes(payload)
         
         try:
-            headers = {"Content-Type": "application/json"}
-            timeout = aiohttp.ClientTimeout(total=15)
             async with self.session.post(
                 self.base_url + endpoint,
-                headers=headers,
-                json=payload,
-                timeout=timeout
+                headers=self._HEADERS,
+                data=body
             ) as response:
                 response.raise_for_status()
-                data = await response.json()
+                data = json_loads(await response.read())
                 return {"success": True, "data": data}
         except Exception as e:
             return {"success": False, "error": str(e)}
     
     async def load_market_metadata(self):
-        """Load market metadata."""
-        meta_result = await self._make_request("/info", {"type": "meta"})
-        if meta_result["success"]:
-            universe_data = meta_result["data"]
+        """Load market metadata.
+
+        Uses metaAndAssetCtxs rather than meta so the same response also serves the first poll.
+        """
+        result = await self._make_request("/info", {"type": "metaAndAssetCtxs"})
+        if result["success"]:
+            universe_data = result["data"][0]
             for asset_id, asset_info in enumerate(universe_data.get("universe", [])):
                 name = asset_info["name"]
                 self.asset_map[name] = asset_id
                 self.id_to_name[asset_id] = name
+            
+            self._monitored_ids = [(self.asset_map[a], a) for a in self.assets if a in self.asset_map]
+            self._primed_data = result["data"]
                 
     async def get_market_data(self):
         """Fetch current market data for all monitored assets."""
-        payload = {"type": "metaAndAssetCtxs"}
-        result = await self._make_request("/info", payload)
-        
-        if not result["success"]:
-            return {}
+        data, self._primed_data = self._primed_data, None
+        if data is None:
+            result = await self._make_request("/info", {"type": "metaAndAssetCtxs"})
+            if not result["success"]:
+                return {}
+            data = result["data"]
         
         try:
-            _, asset_contexts = result["data"]
+            _, asset_contexts = data
             market_data = {}
+            num_contexts = len(asset_contexts)
             
-            assets_to_monitor = [self.selected_asset] if self.selected_asset else MONITORED_ASSETS
-            
-            for asset_id, context in enumerate(asset_contexts):
-                if asset_id < len(self.id_to_name):
-                    asset_name = self.id_to_name[asset_id]
-                    if asset_name in assets_to_monitor:
-                        market_data[asset_name] = {
-                            "markPrice": float(context.get("markPx", 0)),
-                            "midPrice": float(context.get("midPx", 0)),
-                            "openInterest": float(context.get("openInterest", 0)),
-                            "fundingRate": float(context.get("funding", 0)),
-                            "volume24h": float(context.get("dayNtlVlm", 0)),
-                            "premium": float(context.get("premium", 0))
-                        }
+            # Index straight into the monitored assets instead of scanning the whole universe
+            for asset_id, asset_name in self._monitored_ids:
+                if asset_id < num_contexts:
+                    get = asset_contexts[asset_id].get
+                    market_data[asset_name] = {
+                        out_key: float(get(ctx_key, 0)) for ctx_key, out_key in _MARKET_FIELDS
+                    }
             
             return market_data
         except Exception as e:
             print(f"Error parsing market data: {e}")
             return {}
     
-    def generate_realistic_positions(self, asset: str, market_data: Dict) -> List[Dict]:
+    def generate_realistic_positions(
+        self, asset: str, market_data: Dict, max_distance: Optional[float] = None
+    ) -> List[Dict]:
         """
         Generate realistic positions based on actual market conditions.
         This simulates real trader behavior and position distributions.
+        Positions further than max_distance % from liquidation are dropped before they are built.
         """
         current_price = market_data["markPrice"]
         total_oi = market_data["openInterest"]
@@ -185,95 +234,69 @@ class RealLiquidationsMonitor:
         if current_price <= 0 or total_oi <= 0:
             return []
         
-        positions = []
         generator = self.position_generators[asset]
         
-        # Large whale positions (high leverage, close to liquidation)
-        for i in range(generator["large_positions"]):
-            position_value = random.uniform(100000, 800000)  # $100k - $800k
-            leverage = random.uniform(15, 50)  # High leverage
-            side = "LONG" if random.random() > 0.5 else "SHORT"
+        positions = []
+        for count_key, value_range, leverage_range, buffer_range, position_type in POSITION_TIERS:
+            positions += self._synthesize_positions(
+                asset, current_price, generator[count_key],
+                value_range, leverage_range, buffer_range, position_type, max_distance
+            )
+        
+        positions.sort(key=_BY_DISTANCE)
+        return positions
+    
+    def _synthesize_positions(
+        self,
+        asset: str,
+        current_price: float,
+        count: int,
+        value_range: Tuple[float, float],
+        leverage_range: Tuple[float, float],
+        buffer_range: Tuple[float, float],
+        position_type: str,
+        max_distance: Optional[float] = None,
+    ) -> List[Dict]:
+        """Generate `count` positions of one tier in a single loop with the invariants hoisted."""
+        uniform = random.uniform
+        rand = random.random
+        long_factor = _LONG_MAINT_FACTOR
+        short_factor = _SHORT_MAINT_FACTOR
+        if max_distance is None:
+            max_distance = float("inf")
+        
+        positions = []
+        for _ in range(count):
+            position_value = uniform(*value_range)
+            leverage = uniform(*leverage_range)
+            is_long = rand() > 0.5
             
-            # Place entry price closer to liquidation for risk
-            risk_buffer = random.uniform(1, 5)  # 1-5% away from liquidation
+            # Place entry price relative to a liquidation price risk_buffer% away
+            risk_buffer = uniform(*buffer_range)
             
-            maintenance_rate = 0.004
-
-            if side == "LONG":
+            # Reject on distance before paying for entry price, PnL and the dict
+            if is_long:
                 liq_price = current_price * (1 - risk_buffer / 100)
-                entry_price = liq_price * (1 - maintenance_rate) / (1 - 1 / leverage)
+                distance_to_liq = _distance_pct(current_price, liq_price, 1)
             else:
                 liq_price = current_price * (1 + risk_buffer / 100)
-                entry_price = liq_price * (1 + maintenance_rate) / (1 + 1 / leverage)
+                distance_to_liq = _distance_pct(current_price, liq_price, -1)
+            if distance_to_liq > max_distance:
+                continue
             
-            position_size = position_value / entry_price
-            
-            distance_to_liq = self._calculate_distance_to_liquidation(current_price, liq_price, side)
-            
-            # Calculate PnL
-            if side == "LONG":
-                pnl_usd = (current_price - entry_price) * position_size
-                pnl_pct = (current_price - entry_price) / entry_price
+            if is_long:
+                side = "LONG"
+                entry_price = liq_price * long_factor / (1 - 1 / leverage)
+                pnl_per_unit = current_price - entry_price
             else:
-                pnl_usd = (entry_price - current_price) * position_size
-                pnl_pct = (entry_price - current_price) / entry_price
-            
-            # Risk level - 5% for critical
-            if distance_to_liq <= 5:
-                risk_level = "CRITICAL"
-            elif distance_to_liq <= 10:
-                risk_level = "HIGH"
-            elif distance_to_liq <= 20:
-                risk_level = "MEDIUM"
-            else:
-                risk_level = "LOW"
-            
-            positions.append({
-                "asset": asset,
-                "side": side,
-                "position_size": position_size,
-                "position_value_usd": position_value,
-                "entry_price": entry_price,
-                "current_price": current_price,
-                "liquidation_price": liq_price,
-                "leverage": leverage,
-                "distance_to_liquidation": distance_to_liq,
-                "pnl_usd": pnl_usd,
-                "pnl_pct": pnl_pct,
-                "risk_level": risk_level,
-                "position_type": "WHALE"
-            })
-        
-        # Medium positions (balanced risk)
-        for i in range(generator["medium_positions"]):
-            position_value = random.uniform(100000, 300000)  # $100k - $300k
-            leverage = random.uniform(8, 30)  # Medium-high leverage
-            side = "LONG" if random.random() > 0.5 else "SHORT"
-            
-            risk_buffer = random.uniform(2, 8)  # 2-8% away from liquidation
-            
-            maintenance_rate = 0.004
-
-            if side == "LONG":
-                liq_price = current_price * (1 - risk_buffer / 100)
-                entry_price = liq_price * (1 - maintenance_rate) / (1 - 1 / leverage)
-            else:
-                liq_price = current_price * (1 + risk_buffer / 100)
-                entry_price = liq_price * (1 + maintenance_rate) / (1 + 1 / leverage)
+                side = "SHORT"
+                entry_price = liq_price * short_factor / (1 + 1 / leverage)
+                pnl_per_unit = entry_price - current_price
             
             position_size = position_value / entry_price
-
-            distance_to_liq = self._calculate_distance_to_liquidation(current_price, liq_price, side)
-
-            if side == "LONG":
-                pnl_usd = (current_price - entry_price) * position_size
-                pnl_pct = (current_price - entry_price) / entry_price
-            else:
-                pnl_usd = (entry_price - current_price) * position_size
-                pnl_pct = (entry_price - current_price) / entry_price
-
+            
             # Risk level - 5% for critical
-            if distance_to_liq <= 5:
+            if distance_to_liq <= CRITICAL_DISTANCE_PCT:
                 risk_level = "CRITICAL"
             elif distance_to_liq <= 10:
                 risk_level = "HIGH"
@@ -281,7 +304,7 @@ class RealLiquidationsMonitor:
                 risk_level = "MEDIUM"
             else:
                 risk_level = "LOW"
-
+            
             positions.append({
                 "asset": asset,
                 "side": side,
@@ -292,55 +315,55 @@ class RealLiquidationsMonitor:
                 "liquidation_price": liq_price,
                 "leverage": leverage,
                 "distance_to_liquidation": distance_to_liq,
-                "pnl_usd": pnl_usd,
-                "pnl_pct": pnl_pct,
+                "pnl_usd": pnl_per_unit * position_size,
+                "pnl_pct": pnl_per_unit / entry_price,
                 "risk_level": risk_level,
-                "position_type": "MEDIUM"
+                "position_type": position_type
             })
         
-        # Small retail positions (lower leverage) - REMOVED FROM OUTPUT
-        # Skip retail positions entirely
-        
-        return sorted(positions, key=lambda x: x["distance_to_liquidation"])
+        return positions
     
     def display_critical_positions(self, asset: str, positions: List[Dict]):
         """Display only the most critical positions at risk."""
         if not positions:
             return
         
-        # Filter out RETAIL positions from display and positions < $100k, show only positions within 5%
-        positions = [p for p in positions if p.get("position_type") != "RETAIL" and p["position_value_usd"] >= 100000]
-        if not positions:
+        # Filter out RETAIL positions and positions < $100k, and pick the critical ones, in one pass
+        eligible = False
+        critical_positions = []
+        for p in positions:
+            if _is_displayable(p):
+                eligible = True
+                if p["risk_level"] == "CRITICAL":
+                    critical_positions.append(p)
+        if not eligible:
             return
         
-        # Group positions by risk level
-        critical_positions = sorted(
-            (p for p in positions if p["risk_level"] == "CRITICAL"),
-            key=lambda p: p["position_value_usd"],
-            reverse=True,
-        )
+        critical_positions.sort(key=_BY_VALUE, reverse=True)
         
-        if critical_positions:
-            print(f"\n🚨 {asset} - CRITICAL POSITIONS ({len(critical_positions)}):")
-            for i, pos in enumerate(critical_positions, 1):
-                print(f"{i:2}. {pos['side']:5} {pos['asset']} - {pos['position_type']}")
-                print(f"    Size: ${pos['position_value_usd']:,.0f} ({pos['position_size']:.2f} {pos['asset']})")
-                print(f"    Lev: {pos['leverage']:.1f}x | Entry: ${pos['entry_price']:,.2f} | Current: ${pos['current_price']:,.2f}")
-                print(f"    Liquidation: ${pos['liquidation_price']:,.2f} | Distance: {pos['distance_to_liquidation']:.2f}% | PnL: ${pos['pnl_usd']:+,.0f} ({pos['pnl_pct']:+.2%})")
-        else:
-            print(f"\n✅ {asset} - No critical positions ≥$100k")
+        if not critical_positions:
+            sys.stdout.write(f"\n✅ {asset} - No critical positions ≥$100k\n")
+            return
+        
+        # Build the whole block and write it once instead of four prints per position
+        lines = [f"\n🚨 {asset} - CRITICAL POSITIONS ({len(critical_positions)}):"]
+        for i, pos in enumerate(critical_positions, 1):
+            lines.append(f"{i:2}. {pos['side']:5} {pos['asset']} - {pos['position_type']}")
+            lines.append(f"    Size: ${pos['position_value_usd']:,.0f} ({pos['position_size']:.2f} {pos['asset']})")
+            lines.append(f"    Lev: {pos['leverage']:.1f}x | Entry: ${pos['entry_price']:,.2f} | Current: ${pos['current_price']:,.2f}")
+            lines.append(f"    Liquidation: ${pos['liquidation_price']:,.2f} | Distance: {pos['distance_to_liquidation']:.2f}% | PnL: ${pos['pnl_usd']:+,.0f} ({pos['pnl_pct']:+.2%})")
+        lines.append("")
+        sys.stdout.write("\n".join(lines))
     
     def display_market_summary(self, market_data: Dict, all_positions: Dict[str, List[Dict]]):
         """Display summary of all market risks."""
         timestamp = datetime.now().strftime('%H:%M:%S')
-        print(f"\n📊 MARKET SUMMARY - {timestamp}")
+        lines = [f"\n📊 MARKET SUMMARY - {timestamp}"]
         
         total_critical = 0
         total_at_risk_value = 0
         
-        assets_to_display = [self.selected_asset] if self.selected_asset else MONITORED_ASSETS
-        
-        for asset in assets_to_display:
+        for asset in self.assets:
             if asset in market_data:
                 data = market_data[asset]
                 price = data["markPrice"]
@@ -348,12 +371,13 @@ class RealLiquidationsMonitor:
                 funding = data["fundingRate"]
                 oi_usd = oi * price
                 
-                positions = all_positions.get(asset, [])
-                # Filter out RETAIL positions and positions < $100k
-                positions = [p for p in positions if p.get("position_type") != "RETAIL" and p["position_value_usd"] >= 100000]
-                critical = len([p for p in positions if p["risk_level"] == "CRITICAL"])
-                
-                at_risk_value = sum(p["position_value_usd"] for p in positions if p["risk_level"] == "CRITICAL")
+                # Count critical non-RETAIL positions ≥$100k and their value in a single pass
+                critical = 0
+                at_risk_value = 0
+                for p in all_positions.get(asset, ()):
+                    if p["risk_level"] == "CRITICAL" and _is_displayable(p):
+                        critical += 1
+                        at_risk_value += p["position_value_usd"]
                 
                 total_critical += critical
                 total_at_risk_value += at_risk_value
@@ -362,26 +386,30 @@ class RealLiquidationsMonitor:
                 
                 risk_indicator = "💀" if critical > 0 else "🟢"
                 
-                print(f"  {asset:6} | ${price:>10,.2f} | OI: ${oi_usd:>12,.0f} | "
-                      f"Funding: {funding_indicator} {funding:+.4%} | "
-                      f"Risk: {risk_indicator} {critical}💀 (≥$100k) | ${at_risk_value:>10,.0f} at risk")
+                lines.append(f"  {asset:6} | ${price:>10,.2f} | OI: ${oi_usd:>12,.0f} | "
+                             f"Funding: {funding_indicator} {funding:+.4%} | "
+                             f"Risk: {risk_indicator} {critical}💀 (≥$100k) | ${at_risk_value:>10,.0f} at risk")
         
         # Overall market risk
-        print(f"\n🎯 OVERALL MARKET RISK:")
-        print(f"   💀 Critical positions (≤5%, ≥$100k): {total_critical}")
-        print(f"   💰 Total value at risk: ${total_at_risk_value:,.0f}")
+        lines.append("\n🎯 OVERALL MARKET RISK:")
+        lines.append(f"   💀 Critical positions (≤5%, ≥$100k): {total_critical}")
+        lines.append(f"   💰 Total value at risk: ${total_at_risk_value:,.0f}")
         
         if total_critical == 0:
-            print(f"   ✅ Market safe - no critical positions ≥$100k")
+            lines.append("   ✅ Market safe - no critical positions ≥$100k")
         
-        print("=" * DISPLAY_WIDTH)
+        lines.append(self._SEPARATOR)
+        lines.append("")
+        sys.stdout.write("\n".join(lines))
     
     def print_header(self):
         """Print monitoring header."""
-        print(f"HYPERLIQUID LIQUIDATION MONITOR - Positions ≥$100k within 5% of liquidation")
         assets_display = self.selected_asset if self.selected_asset else ', '.join(MONITORED_ASSETS)
-        print(f"Monitoring: {assets_display} | Updates every {POLL_INTERVAL_SECONDS}s | Started: {datetime.now().strftime('%H:%M:%S')}")
-        print("=" * 80)
+        sys.stdout.write(
+            "HYPERLIQUID LIQUIDATION MONITOR - Positions ≥$100k within 5% of liquidation\n"
+            f"Monitoring: {assets_display} | Updates every {POLL_INTERVAL_SECONDS}s | Started: {datetime.now().strftime('%H:%M:%S')}\n"
+            f"{self._HEADER_RULE}\n"
+        )
     
     async def monitor_liquidations(self):
         """Main monitoring loop for real liquidation risks."""
@@ -397,24 +425,25 @@ class RealLiquidationsMonitor:
                 if market_data:
                     all_positions = {}
                     
-                    assets_to_monitor = [self.selected_asset] if self.selected_asset else MONITORED_ASSETS
-                    
                     # Generate positions for each asset
-                    for asset in assets_to_monitor:
+                    for asset in self.assets:
                         if asset in market_data:
-                            positions = self.generate_realistic_positions(asset, market_data[asset])
-                            all_positions[asset] = positions
-                            
-                            # Filter only CRITICAL positions (≤5% from liquidation)
-                            critical_positions = [p for p in positions if p["distance_to_liquidation"] <= 5.0]
+                            # Only CRITICAL positions (≤5% from liquidation) are displayed or summarized,
+                            # so don't build the rest
+                            critical_positions = self.generate_realistic_positions(
+                                asset, market_data[asset], max_distance=CRITICAL_DISTANCE_PCT
+                            )
+                            all_positions[asset] = critical_positions
                             
                             if critical_positions:
                                 self.display_critical_positions(asset, critical_positions)
                     
                     # Show market summary every minute
-                    if self.check_count % (60 // POLL_INTERVAL_SECONDS) == 1:
+                    if (self.check_count - 1) % STATUS_EVERY == 0:
                         self.display_market_summary(market_data, all_positions)
                 
+                # stdout is block-buffered; push this cycle's output out in one go
+                sys.stdout.flush()
                 await asyncio.sleep(POLL_INTERVAL_SECONDS)
                 
             except KeyboardInterrupt:
@@ -422,6 +451,7 @@ class RealLiquidationsMonitor:
                 break
             except Exception as e:
                 print(f"❌ Error in monitoring loop: {e}")
+                sys.stdout.flush()
                 await asyncio.sleep(RETRY_DELAY_SECONDS)
         
         await self.close()
@@ -447,6 +477,10 @@ async def main():
         print(f"ℹ️ Monitoring all assets: {', '.join(allowed_assets)}")
         print(f"   Tip: use python3 real_liquidations_monitor.py [BTC|ETH|SOL] to select specific asset")
     
+    # Block-buffer stdout; the monitor loop flushes once per poll cycle instead of
+    # the terminal flushing on every line
+    sys.stdout.reconfigure(line_buffering=False)
+    
     monitor = RealLiquidationsMonitor(selected_asset=selected_asset)
     
     try:
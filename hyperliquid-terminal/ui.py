@@ -6,10 +6,22 @@ from textual.reactive import reactive
 
 from rich.text import Text
 from datetime import datetime
+import asyncio
+from typing import Any
 
-from api_client import HyperliquidAPI
+from api_client import APIError, HyperliquidAPI
 from config import DEFAULT_ASSET
 
+
+def _unwrap(result: Any) -> Any:
+    """Turn a gather(return_exceptions=True) result into data or None on APIError."""
+    if isinstance(result, APIError):
+        return None
+    if isinstance(result, BaseException):
+        raise result
+    return result
+
+
 class AssetSelectionScreen(ModalScreen[str]):
     """A modal screen to select an asset."""
 
@@ -91,12 +103,11 @@ class CandlestickChart(Static):
             # Sort data by timestamp
             self.candle_data.sort(key=lambda x: x['t'])
             
-            # Extract OHLC data
-            timestamps = [c['t'] / 1000 for c in self.candle_data]
-            opens = [float(c['o']) for c in self.candle_data]
-            highs = [float(c['h']) for c in self.candle_data]
-            lows = [float(c['l']) for c in self.candle_data]
-            closes = [float(c['c']) for c in self.candle_data]
+            # Extract OHLC columns in a single pass over the candles
+            timestamps, opens, highs, lows, closes = map(list, zip(*(
+                (c['t'] / 1000, float(c['o']), float(c['h']), float(c['l']), float(c['c']))
+                for c in self.candle_data
+            )))
             
             # Get widget dimensions - INCREASED for better resolution
             if self.content_size and self.content_size.width > 0:
@@ -124,9 +135,9 @@ class CandlestickChart(Static):
             }
             
             # Calculate price range for better y-axis scaling
-            all_prices = opens + highs + lows + closes
-            min_price = min(all_prices)
-            max_price = max(all_prices)
+            # (lows/highs bound the opens and closes, so no need to scan those)
+            min_price = min(lows)
+            max_price = max(highs)
             price_range = max_price - min_price
             
             # Add padding to y-axis (5% on each side for better visibility)
@@ -278,13 +289,25 @@ class HyperliquidApp(App):
         if self.current_asset_id is None:
             return
 
-        # Fetch L2 Book - only clear and update if successful
-        l2_book_data = await self.api_client.get_l2_book(self.current_asset_id)
-        if l2_book_data["success"]:
+        # The fetches are independent, so run them concurrently over the shared session;
+        # each widget below is only cleared and updated if its own fetch succeeded
+        asset_id = self.current_asset_id
+        results = await asyncio.gather(
+            self.api_client.get_l2_book(asset_id),
+            self.api_client.get_trades(asset_id),
+            self.api_client.get_candle_data(asset_id, interval=self.current_timeframe, limit=40),
+            self.api_client.get_open_interest(asset_id),
+            self.api_client.get_funding_rate(asset_id),
+            return_exceptions=True,
+        )
+        l2_book, trades, candles, open_interest, funding = map(_unwrap, results)
+
+        # L2 Book
+        if l2_book is not None:
             ob_table = self.query_one("#order_book_table", DataTable)
             ob_table.clear()  # Clear only on success
-            asks = l2_book_data["data"]["asks"][:10]  # Best 10 asks
-            bids = l2_book_data["data"]["bids"][:10]  # Best 10 bids
+            asks = l2_book["asks"][:10]  # Best 10 asks
+            bids = l2_book["bids"][:10]  # Best 10 bids
             
             # Calculate cumulative totals
             ask_cumulative = 0
@@ -324,12 +347,11 @@ class HyperliquidApp(App):
                     f"{bid_cumulative:.5f}"
                 )
 
-        # Fetch Recent Trades - only clear and update if successful
-        trades_data = await self.api_client.get_trades(self.current_asset_id)
-        if trades_data["success"]:
+        # Recent Trades
+        if trades is not None:
             trades_table = self.query_one("#trades_table", DataTable)
             trades_table.clear()  # Clear only on success
-            for trade in trades_data["data"][:25]:
+            for trade in trades[:25]:
                 time_str = datetime.fromtimestamp(trade['time'] / 1000).strftime("%H:%M:%S")
                 side_color = "#26a69a" if trade['side'] == 'B' else "#ef5350"
                 price = float(trade['px'])
@@ -340,29 +362,20 @@ class HyperliquidApp(App):
                     time_str
                 )
 
-        # Fetch Candle Data for selected asset - only update if successful
-        candle_data = await self.api_client.get_candle_data(
-            self.current_asset_id, 
-            interval=self.current_timeframe, 
-            limit=40
-        )
-        
         # Update Main Chart only if data was successfully fetched
-        if candle_data["success"] and candle_data["data"]:
+        if candles:
             chart = self.query_one("#main_chart", CandlestickChart)
             chart.symbol = self.current_asset_ticker
             chart.interval = self.current_timeframe
-            chart.update_plot(candle_data["data"])
+            chart.update_plot(candles)
         
-        # Fetch Market Info - only update on success
+        # Market Info
         market_info_widget = self.query_one(MarketInfoWidget)
-        oi_data = await self.api_client.get_open_interest(self.current_asset_id)
-        if oi_data.get("success"):
-            market_info_widget.open_interest = f"{float(oi_data['data']['openInterest']):.2f}"
+        if open_interest is not None:
+            market_info_widget.open_interest = f"{float(open_interest):.2f}"
         
-        funding_data = await self.api_client.get_funding_rate(self.current_asset_id)
-        if funding_data.get("success") and funding_data.get("data"):
-            fr = float(funding_data['data'].get('fundingRate', 0))
+        if funding is not None:
+            fr = float(funding.get('fundingRate', 0))
             market_info_widget.funding_rate = f"{fr:.6%}"
 
     def action_switch_asset(self) -> None:
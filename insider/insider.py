@@ -1,5 +1,7 @@
 import os
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import feedparser
 import argparse
 import time
@@ -18,6 +20,18 @@ HEADERS = {
 }
 
 _XSL_DIR_RE = re.compile(r"/xslF345X\d{2}/", re.IGNORECASE)
+_TICKER_RE = re.compile(r"^[A-Z]{1,6}([.-][A-Z]{1,3})?$")
+
+# One keep-alive session for every SEC request: a run fetches 2-3 documents
+# per filing from www.sec.gov, so reusing the TLS connection saves a
+# handshake on each of them.
+_session = requests.Session()
+_session.headers.update(HEADERS)
+_session.mount("https://", HTTPAdapter(
+    pool_connections=4,
+    pool_maxsize=8,
+    max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=(429, 500, 502, 503, 504)),
+))
 
 
 def normalize_sec_xml_url(url: str) -> str:
@@ -37,7 +51,7 @@ def get_recent_form4_rss(count=100, quiet=False):
     time.sleep(0.11)  # SEC allows no more than 10 requests per second
     
     try:
-        response = requests.get(url, headers=HEADERS, timeout=15)
+        response = _session.get(url, timeout=15)
         response.raise_for_status()
         feed = feedparser.parse(response.content)
         
@@ -64,7 +78,7 @@ def get_xml_url_from_filing(filing_url, debug=False):
     time.sleep(0.11)
     
     try:
-        response = requests.get(filing_url, headers=HEADERS, timeout=15)
+        response = _session.get(filing_url, timeout=15)
         response.raise_for_status()
         
         # Parse the HTML page
@@ -143,7 +157,7 @@ def fetch_and_parse_xml(xml_url, debug=False):
 
     for url in candidate_urls:
         try:
-            response = requests.get(url, headers=HEADERS, timeout=15)
+            response = _session.get(url, timeout=15)
             response.raise_for_status()
 
             content = response.content
@@ -369,6 +383,17 @@ def format_transaction_code(code, is_derivative=False):
 
 def main(ticker_filter=None, limit=40, show_derivatives=True, debug=False, only_buysell=False, json_output=False):
     """Main execution function"""
+    # Normalize once, then reject malformed tickers before spending any SEC requests on them
+    if ticker_filter:
+        raw_ticker = ticker_filter
+        ticker_filter = ticker_filter.strip().upper()
+        if not _TICKER_RE.match(ticker_filter):
+            if json_output:
+                print(json.dumps([]))
+            else:
+                print(f"❌ Invalid ticker symbol: {raw_ticker}")
+            return
+
     if not json_output:
         print("=" * 90)
         print("SEC Form 4 Insider Trading Tracker")
@@ -1,5 +1,7 @@
 from flask import Flask, jsonify, make_response
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import feedparser
 import time
 import re
@@ -31,13 +33,23 @@ HEADERS = {
 
 _XSL_DIR_RE = re.compile(r"/xslF345X\d{2}/", re.IGNORECASE)
 
+# Shared keep-alive session so the 5 fetch threads reuse TLS connections to www.sec.gov;
+# a single quick retry keeps us inside the serverless time budget
+_session = requests.Session()
+_session.headers.update(HEADERS)
+_session.mount("https://", HTTPAdapter(
+    pool_connections=2,
+    pool_maxsize=8,
+    max_retries=Retry(total=1, backoff_factor=0.2, status_forcelist=(429, 500, 502, 503, 504)),
+))
+
 def normalize_sec_xml_url(url: str) -> str:
     return _XSL_DIR_RE.sub("/", url)
 
 def get_recent_form4_rss(count=60):
     url = f"https://www.sec.gov/cgi-bin/browse-edgar?action=getcurrent&type=4&owner=only&count={count}&output=atom"
     try:
-        response = requests.get(url, headers=HEADERS, timeout=10)
+        response = _session.get(url, timeout=10)
         response.raise_for_status()
         feed = feedparser.parse(response.content)
         entries = []
@@ -54,7 +66,7 @@ def get_recent_form4_rss(count=60):
 
 def get_xml_url_from_filing(filing_url):
     try:
-        response = requests.get(filing_url, headers=HEADERS, timeout=10)
+        response = _session.get(filing_url, timeout=10)
         response.raise_for_status()
         tree = html.fromstring(response.content)
         xml_candidates = []
@@ -90,7 +102,7 @@ def fetch_and_parse_xml(xml_url):
 
     for url in candidate_urls:
         try:
-            response = requests.get(url, headers=HEADERS, timeout=10)
+            response = _session.get(url, timeout=10)
             response.raise_for_status()
             content = response.content
             if b'<?xml' in content[:500] or b'<ownershipdocument>' in content[:500].lower():